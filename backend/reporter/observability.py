@@ -5,54 +5,60 @@ Provides a simple context manager for setting up and flushing traces.
 
 import os
 import logging
-from contextlib import contextmanager
+import threading
+from contextlib import contextmanager, nullcontext
 
 # Use root logger for Lambda compatibility
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Environment is fixed for the lifetime of the process, so resolve it once
+_HAS_LANGFUSE = bool(os.environ.get("LANGFUSE_SECRET_KEY"))
+_HAS_OPENAI = bool(os.environ.get("OPENAI_API_KEY"))
 
-@contextmanager
-def observe():
-    """
-    Context manager for observability with LangFuse.
+# Flush synchronously on Lambda unless LANGFUSE_ENFORCE_FLUSH says otherwise
+_enforce_flush_env = os.environ.get("LANGFUSE_ENFORCE_FLUSH")
+if _enforce_flush_env is None:
+    _ENFORCE_FLUSH = bool(os.environ.get("AWS_LAMBDA_FUNCTION_NAME"))
+else:
+    _ENFORCE_FLUSH = _enforce_flush_env.lower() in ("1", "true", "yes")
 
-    Sets up LangFuse observability if environment variables are configured,
-    and ensures traces are flushed on exit.
+logger.info("[CHECK] Observability: LANGFUSE_SECRET_KEY exists: %s", _HAS_LANGFUSE)
+logger.info("[CHECK] Observability: OPENAI_API_KEY exists: %s", _HAS_OPENAI)
 
-    Usage:
-        from observability import observe
+# One-shot LangFuse setup shared by every observe() call in the process
+_init_lock = threading.Lock()
+_initialized = False
+_langfuse_client = None
 
-        with observe():
-            # Your code that uses OpenAI Agents SDK
-            result = await agent.run(...)
+
+def _ensure_langfuse_initialized():
+    """Run LangFuse setup once per process and return the shared client.
+
+    Returns None if setup failed; a failed setup is not retried.
     """
-    logger.info("[CHECK] Observability: Checking configuration...")
+    global _initialized, _langfuse_client
 
-    # Check if required environment variables exist
-    has_langfuse = bool(os.getenv("LANGFUSE_SECRET_KEY"))
-    has_openai = bool(os.getenv("OPENAI_API_KEY"))
+    if _initialized:
+        return _langfuse_client
 
-    logger.info(f"[CHECK] Observability: LANGFUSE_SECRET_KEY exists: {has_langfuse}")
-    logger.info(f"[CHECK] Observability: OPENAI_API_KEY exists: {has_openai}")
+    with _init_lock:
+        if not _initialized:
+            _langfuse_client = _setup_langfuse()
+            _initialized = True
+    return _langfuse_client
 
-    if not has_langfuse:
-        logger.info("[CHECK] Observability: LangFuse not configured, skipping setup")
-        yield None
-        return
 
-    if not has_openai:
+def _setup_langfuse():
+    """Instrument the OpenAI Agents SDK and create the LangFuse client."""
+    if not _HAS_OPENAI:
         logger.warning("[WARNING]  Observability: OPENAI_API_KEY not set, traces may not export")
 
-    # Local variable for the client (no global needed)
-    langfuse_client = None
-
-    # Try to set up LangFuse
     try:
         logger.info("[CHECK] Observability: Setting up LangFuse...")
 
         import logfire
-        from langfuse import get_client
+        from langfuse import Langfuse
 
         # Configure logfire to instrument OpenAI Agents SDK
         logfire.configure(
@@ -65,27 +71,65 @@ def observe():
         logfire.instrument_openai_agents()
         logger.info("[OK] Observability: OpenAI Agents SDK instrumented")
 
-        # Initialize LangFuse client
-        langfuse_client = get_client()
+        # Initialize LangFuse client with batched span export
+        langfuse_client = Langfuse(
+            flush_at=int(os.environ.get("LANGFUSE_FLUSH_AT", "50")),
+            flush_interval=float(os.environ.get("LANGFUSE_FLUSH_INTERVAL", "1")),
+        )
         logger.info("[OK] Observability: LangFuse client initialized")
 
         # Optional: Check authentication (blocking call, use sparingly)
         try:
             auth_result = langfuse_client.auth_check()
             logger.info(
-                f"[OK] Observability: LangFuse authentication check passed (result: {auth_result})"
+                "[OK] Observability: LangFuse authentication check passed (result: %s)", auth_result
             )
         except Exception as auth_error:
-            logger.warning(f"[WARNING]  Observability: Auth check failed but continuing: {auth_error}")
+            logger.warning("[WARNING]  Observability: Auth check failed but continuing: %s", auth_error)
 
         logger.info("[TARGET] Observability: Setup complete - traces will be sent to LangFuse")
+        return langfuse_client
 
     except ImportError as e:
-        logger.error(f"[ERROR] Observability: Missing required package: {e}")
-        langfuse_client = None
+        logger.error("[ERROR] Observability: Missing required package: %s", e)
+    except Exception as e:
+        logger.error("[ERROR] Observability: Setup failed: %s", e)
+    return None
+
+
+def _flush_langfuse(langfuse_client):
+    """Flush pending traces to LangFuse."""
+    try:
+        logger.info("[CHECK] Observability: Flushing traces to LangFuse...")
+        # flush() blocks until the exporter has sent every queued span. The
+        # client is reused across invocations, so it is not shut down here;
+        # LangFuse shuts it down itself at interpreter exit.
+        langfuse_client.flush()
+
+        logger.info("[OK] Observability: Traces flushed successfully")
     except Exception as e:
-        logger.error(f"[ERROR] Observability: Setup failed: {e}")
-        langfuse_client = None
+        logger.error("[ERROR] Observability: Failed to flush traces: %s", e)
+
+
+@contextmanager
+def observe():
+    """
+    Context manager for observability with LangFuse.
+
+    Sets up LangFuse observability if environment variables are configured,
+    and ensures traces are flushed on exit. Setup happens on first use and
+    is shared by later calls in the same process. Span batching can be tuned
+    with LANGFUSE_FLUSH_AT (spans per batch, default 50) and
+    LANGFUSE_FLUSH_INTERVAL (seconds between exports, default 1).
+
+    Usage:
+        from observability import observe
+
+        with observe():
+            # Your code that uses OpenAI Agents SDK
+            result = await agent.run(...)
+    """
+    langfuse_client = _ensure_langfuse_initialized()
 
     try:
         # Yield control back to the calling code
@@ -93,20 +137,19 @@ def observe():
     finally:
         # Flush traces on exit
         if langfuse_client:
-            try:
-                logger.info("[CHECK] Observability: Flushing traces to LangFuse...")
-                langfuse_client.flush()
-                langfuse_client.shutdown()
-
-                # Add a 10 second delay to ensure network requests complete
-                # This is a workaround for Lambda's immediate termination
-                import time
-
-                logger.info("[CHECK] Observability: Waiting 10 seconds for flush to complete...")
-                time.sleep(10)
-
-                logger.info("[OK] Observability: Traces flushed successfully")
-            except Exception as e:
-                logger.error(f"[ERROR] Observability: Failed to flush traces: {e}")
+            if _ENFORCE_FLUSH:
+                # Lambda may freeze the process as soon as the handler returns,
+                # so flush synchronously before handing control back
+                _flush_langfuse(langfuse_client)
+            else:
+                logger.info("[CHECK] Observability: Flushing traces in background thread...")
+                threading.Thread(
+                    target=_flush_langfuse, args=(langfuse_client,), daemon=True
+                ).start()
         else:
             logger.debug("[CHECK] Observability: No client to flush")
+
+
+if not _HAS_LANGFUSE:
+    # Nothing to set up or flush, so skip the generator machinery entirely
+    observe = nullcontext
@@ -1,33 +1,209 @@
 """
 MCP server configurations for the Alex Researcher
 """
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
 from agents.mcp import MCPServerStdio
 
+# Warm Playwright MCP servers kept between requests
+MAX_PLAYWRIGHT_SERVERS = int(os.getenv("MAX_PLAYWRIGHT_SERVERS", "2"))
+PLAYWRIGHT_SERVER_MAX_USES = int(os.getenv("PLAYWRIGHT_SERVER_MAX_USES", "20"))
+
+# Session timeout, and the connect time above which a slow-startup warning is printed
+PLAYWRIGHT_MCP_TIMEOUT_S = float(os.getenv("PLAYWRIGHT_MCP_TIMEOUT_S", "60"))
+PLAYWRIGHT_MCP_SLOW_WARN_S = float(os.getenv("PLAYWRIGHT_MCP_SLOW_WARN_S", "15"))
+_slow_start_warned = False
+
+# How long a pooled server gets to answer the health-check ping on checkout
+_PING_TIMEOUT_S = 5
+
+# Arguments for the MCP server
+_PLAYWRIGHT_ARGS = (
+    "@playwright/mcp",
+    "--headless",
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--ignore-https-errors",
+)
+
+_PLAYWRIGHT_PARAMS = {
+    "command": "npx",
+    "args": list(_PLAYWRIGHT_ARGS)
+}
 
-def create_playwright_mcp_server(timeout_seconds=60):
+
+def create_playwright_mcp_server(timeout_seconds=PLAYWRIGHT_MCP_TIMEOUT_S):
     """Create a Playwright MCP server instance for web browsing.
     
     Args:
-        timeout_seconds: Client session timeout in seconds (default: 60)
+        timeout_seconds: Client session timeout in seconds
+            (default: PLAYWRIGHT_MCP_TIMEOUT_S, 60 unless set)
         
     Returns:
         MCPServerStdio instance configured for Playwright
     """
-    # Arguments for the MCP server
-    args = [
-        "@playwright/mcp",
-        "--headless",
-        "--no-sandbox",
-        "--disable-setuid-sandbox",
-        "--disable-dev-shm-usage",
-        "--ignore-https-errors",
-    ]
-    
-    params = {
-        "command": "npx",
-        "args": args
-    }
-    
-    return MCPServerStdio(params=params, client_session_timeout_seconds=timeout_seconds)
-    
-    return MCPServerStdio(params=params, client_session_timeout_seconds=timeout_seconds)
\ No newline at end of file
+    # The tool list is fixed for a given @playwright/mcp build, so fetch it
+    # once per server instead of on every agent turn
+    return MCPServerStdio(
+        params=_PLAYWRIGHT_PARAMS,
+        cache_tools_list=True,
+        client_session_timeout_seconds=timeout_seconds,
+    )
+
+
+def _warn_if_slow(elapsed):
+    """Print a one-time warning if an MCP server took too long to start."""
+    global _slow_start_warned
+    if elapsed > PLAYWRIGHT_MCP_SLOW_WARN_S and not _slow_start_warned:
+        _slow_start_warned = True
+        print(
+            f"[WARNING]  Playwright MCP server took {elapsed:.1f}s to start "
+            f"(PLAYWRIGHT_MCP_SLOW_WARN_S={PLAYWRIGHT_MCP_SLOW_WARN_S:g})"
+        )
+
+
+class _PooledServer:
+    """A connected MCP server owned by a dedicated background task.
+
+    The MCP stdio client must be closed by the task that opened it, so the
+    owner task connects, waits until asked to stop, then cleans up.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.uses = 0
+        self._stop = asyncio.Event()
+        self._task = None
+
+    async def start(self):
+        ready = asyncio.get_running_loop().create_future()
+
+        async def own():
+            started = time.monotonic()
+            try:
+                await self.server.connect()
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                return
+            _warn_if_slow(time.monotonic() - started)
+            if not ready.done():
+                ready.set_result(None)
+            try:
+                await self._stop.wait()
+            finally:
+                await self.server.cleanup()
+
+        self._task = asyncio.create_task(own())
+        try:
+            await ready
+        except asyncio.CancelledError:
+            # Let the owner task clean up as soon as it has connected
+            self._stop.set()
+            raise
+
+    @property
+    def alive(self):
+        return self._task is not None and not self._task.done()
+
+    async def healthy(self):
+        """Ping the server to check that the process and session still work.
+
+        The owner task only waits to be stopped, so it doesn't notice when
+        npx/Chromium dies while the server sits idle in the pool.
+        """
+        session = self.server.session
+        if not self.alive or session is None:
+            return False
+        try:
+            await asyncio.wait_for(session.send_ping(), timeout=_PING_TIMEOUT_S)
+        except Exception:
+            return False
+        return True
+
+    async def stop(self):
+        self._stop.set()
+        if self._task:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPServerPool:
+    """Keeps warm Playwright MCP servers so each request skips the npx/Chromium startup.
+
+    Servers are handed out exclusively (they hold browser state) and pinged
+    on checkout so a dead one is replaced rather than handed out. Up to
+    max_servers are kept warm; when none is free a fresh one is started, so
+    concurrent requests never wait on each other. Servers are recycled after
+    max_uses requests, and discarded if the request using them fails.
+
+    Usage:
+        pool = MCPServerPool()
+
+        async with pool.acquire() as playwright_mcp:
+            agent = Agent(..., mcp_servers=[playwright_mcp])
+
+        await pool.aclose_all()  # on shutdown
+    """
+
+    def __init__(
+        self,
+        max_servers=MAX_PLAYWRIGHT_SERVERS,
+        max_uses=PLAYWRIGHT_SERVER_MAX_USES,
+        timeout_seconds=PLAYWRIGHT_MCP_TIMEOUT_S,
+    ):
+        self.max_uses = max_uses
+        self.timeout_seconds = timeout_seconds
+        self.max_servers = max_servers
+        self._idle = []
+        self._stopping = set()
+        self._closed = False
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow a connected server, starting a new one if none is idle."""
+        pooled = None
+        while self._idle and pooled is None:
+            candidate = self._idle.pop()
+            if await candidate.healthy():
+                pooled = candidate
+            else:
+                await candidate.stop()
+        if pooled is None:
+            pooled = _PooledServer(create_playwright_mcp_server(self.timeout_seconds))
+            try:
+                await pooled.start()
+            except asyncio.CancelledError:
+                # The owner task is still connecting; keep track of it so
+                # aclose_all() waits for its cleanup
+                self._stopping.add(pooled._task)
+                pooled._task.add_done_callback(self._stopping.discard)
+                raise
+
+        healthy = False
+        try:
+            yield pooled.server
+            healthy = True
+        finally:
+            pooled.uses += 1
+            if (
+                healthy
+                and not self._closed
+                and pooled.alive
+                and pooled.uses < self.max_uses
+                and len(self._idle) < self.max_servers
+            ):
+                self._idle.append(pooled)
+            else:
+                await pooled.stop()
+
+    async def aclose_all(self):
+        """Shut down all idle servers; servers in use are shut down on release."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        await asyncio.gather(
+            *(pooled.stop() for pooled in idle), *self._stopping, return_exceptions=True
+        )
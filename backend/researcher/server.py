@@ -4,6 +4,7 @@ Alex Researcher Service - Investment Advice Agent
 
 import os
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime, UTC
 from typing import Optional
 
@@ -18,13 +19,24 @@ logging.getLogger("LiteLLM").setLevel(logging.CRITICAL)
 
 # Import from our modules
 from context import get_agent_instructions, DEFAULT_RESEARCH_PROMPT
-from mcp_servers import create_playwright_mcp_server
+from mcp_servers import MCPServerPool
 from tools import ingest_financial_document
 
 # Load environment
 load_dotenv(override=True)
 
-app = FastAPI(title="Alex Researcher Service")
+# Warm Playwright MCP servers shared across research requests
+playwright_pool = MCPServerPool()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Shut down pooled MCP servers when the app stops."""
+    yield
+    await playwright_pool.aclose_all()
+
+
+app = FastAPI(title="Alex Researcher Service", lifespan=lifespan)
 
 
 # Request model
@@ -55,7 +67,7 @@ async def run_research_agent(topic: str = None) -> str:
     with trace("Researcher"):
         try:
             print("🔧 Attempting to initialize Playwright MCP server...")
-            async with create_playwright_mcp_server(timeout_seconds=60) as playwright_mcp:
+            async with playwright_pool.acquire() as playwright_mcp:
                 print("✓ Playwright MCP server initialized successfully")
                 agent = Agent(
                     name="Alex Investment Researcher",
@@ -4,90 +4,215 @@ Test all agents by running their individual test_simple.py files in their own di
 This ensures each agent runs with its own dependencies and environment.
 """
 
+import asyncio
 import os
-import subprocess
+import re
+import signal
 import sys
+from collections import deque
 from pathlib import Path
 
-def test_agent(agent_name, test_file="test_simple.py"):
-    """Test an individual agent in its directory."""
+# Lines of stdout/stderr kept per agent for the report
+OUTPUT_TAIL_LINES = 200
+
+# Chunk size for reading agent output, and the length long lines are cut to
+_READ_CHUNK_BYTES = 64 * 1024
+_MAX_LINE_BYTES = 64 * 1024
+
+# Seconds a timed-out test gets to exit after SIGTERM before it is killed
+KILL_GRACE_SECONDS = 5
+
+# Environment passed to agent subprocesses: process essentials (including
+# Windows ones), proxy/CA settings, and anything for AWS, uv and the LLM APIs.
+# Names are matched case-insensitively so lowercase http_proxy etc. pass too.
+_ENV_KEEP = frozenset((
+    'PATH', 'HOME', 'USER', 'LANG', 'LC_ALL', 'TMPDIR', 'TERM',
+    'SYSTEMROOT', 'COMSPEC', 'PATHEXT', 'TEMP', 'TMP',
+    'USERPROFILE', 'APPDATA', 'LOCALAPPDATA',
+    'HTTP_PROXY', 'HTTPS_PROXY', 'ALL_PROXY', 'NO_PROXY',
+    'SSL_CERT_FILE', 'SSL_CERT_DIR', 'REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE',
+))
+_ENV_KEEP_PREFIXES = ('AWS_', 'UV_', 'OPENAI_', 'LANGFUSE_')
+
+# Patterns used to pick report lines out of agent output
+_SUMMARY_RE = re.compile(r'Tagged:|Success:|Message:')
+_ERR_RE = re.compile(r'Traceback|Error:|Exception:')
+_NOISE_RE = re.compile(r'INFO|LiteLLM completion\(\)')
+
+async def _drain(stream, lines):
+    """Read a subprocess stream line by line into a bounded deque.
+
+    Reads fixed-size chunks rather than using readline(), so an over-long
+    line is truncated instead of stopping the drain and stalling the child.
+    """
+    partial = b''
+    while chunk := await stream.read(_READ_CHUNK_BYTES):
+        *complete, partial = (partial + chunk).split(b'\n')
+        for line in complete:
+            lines.append(line[:_MAX_LINE_BYTES].decode(errors='replace').rstrip('\r'))
+        # Only the head of an unfinished line is ever reported, so don't buffer more
+        partial = partial[:_MAX_LINE_BYTES]
+    if partial:
+        lines.append(partial[:_MAX_LINE_BYTES].decode(errors='replace').rstrip('\r'))
+
+async def _kill_tree(proc):
+    """Kill a timed-out or interrupted test along with everything uv spawned under it."""
+    if os.name == 'posix':
+        # The test runs in its own session, so its pid is also the process group id
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        # Sweep up children (e.g. Chromium) that outlived or ignored SIGTERM
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        killer = await asyncio.create_subprocess_exec(
+            'taskkill', '/F', '/T', '/PID', str(proc.pid),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        await killer.wait()
+    await proc.wait()
+
+async def test_agent_async(agent_name, test_file="test_simple.py"):
+    """Test an individual agent in its directory.
+
+    Returns (success, output lines) so concurrent runs don't interleave their output.
+    """
+    output = []
     backend_dir = Path(__file__).parent
     agent_dir = backend_dir / agent_name
     
     if not agent_dir.exists():
-        print(f"  [SKIP] {agent_name}: Directory not found")
-        return False
+        output.append(f"  [SKIP] {agent_name}: Directory not found")
+        return False, output
     
     test_path = agent_dir / test_file
     if not test_path.exists():
-        print(f"  [SKIP] {agent_name}: No {test_file} found, skipping")
-        return True  # Not a failure, just skip
-    
-    # Set environment for mocked lambdas
-    env = os.environ.copy()
+        output.append(f"  [SKIP] {agent_name}: No {test_file} found, skipping")
+        return True, output  # Not a failure, just skip
+    
+    # Pass through only what the agent needs (the rest comes from .env) and
+    # mock the lambdas. VIRTUAL_ENV is left out to avoid conflicts with
+    # subdirectory uv projects.
+    env = {k: v for k, v in os.environ.items()
+           if k.upper() in _ENV_KEEP or k.startswith(_ENV_KEEP_PREFIXES)}
     env['MOCK_LAMBDAS'] = 'true'
-    # Unset VIRTUAL_ENV to avoid conflicts with subdirectory uv projects
-    env.pop('VIRTUAL_ENV', None)
     
-    # Run the test with uv (with timeout to prevent hanging)
-    cmd = ['uv', 'run', test_file]
-    print(f"Running in {agent_dir}: {' '.join(cmd)}")
-    print(f"  [TESTING] May take 15-30 seconds due to LLM calls...")
+    # Run the test with uv (with timeout to prevent hanging).
+    # --frozen reuses the agent's uv.lock as-is instead of re-resolving it on every run
+    cmd = ['uv', 'run', '--frozen', test_file]
+    output.append(f"Running in {agent_dir}: {' '.join(cmd)}")
+    output.append(f"  [TESTING] May take 15-30 seconds due to LLM calls...")
+    
+    # Stream output line by line, keeping only the tail, so chatty agents
+    # don't pile their whole log up in memory
+    stdout_lines = deque(maxlen=OUTPUT_TAIL_LINES)
+    stderr_lines = deque(maxlen=OUTPUT_TAIL_LINES)
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=str(agent_dir),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+        start_new_session=(os.name == 'posix')  # So a timeout can kill the whole tree
+    )
+    readers = [
+        asyncio.create_task(_drain(proc.stdout, stdout_lines)),
+        asyncio.create_task(_drain(proc.stderr, stderr_lines)),
+    ]
     
     try:
-        result = subprocess.run(
-            cmd, 
-            cwd=str(agent_dir), 
-            capture_output=True, 
-            text=True, 
-            env=env,
-            timeout=120  # 120 second timeout (2 minutes)
-        )
-        success = result.returncode == 0
-        stdout = result.stdout
-        stderr = result.stderr
-    except subprocess.TimeoutExpired:
-        print(f"  [FAIL] {agent_name}: Test TIMEOUT (>120s)")
-        return False
+        returncode = await asyncio.wait_for(proc.wait(), timeout=120)  # 120 second timeout (2 minutes)
+    except asyncio.TimeoutError:
+        await _kill_tree(proc)
+        returncode = None
+    except BaseException:
+        # Interrupted (e.g. Ctrl-C cancelling the run). The test is in its own
+        # session so it never saw the SIGINT; kill it rather than orphan it.
+        if proc.returncode is None:
+            await asyncio.shield(_kill_tree(proc))
+        raise
+    
+    # Give the readers a moment to pick up the last buffered lines; stop
+    # them if something still holds the pipes open
+    _, pending = await asyncio.wait(readers, timeout=5)
+    for reader in pending:
+        reader.cancel()
+    for reader in readers:
+        if not reader.cancelled() and reader.exception():
+            output.append(f"     [WARNING] Lost part of the output: {reader.exception()!r}")
+    
+    if returncode is None:
+        output.append(f"  [FAIL] {agent_name}: Test TIMEOUT (>120s)")
+        return False, output
+    
+    success = returncode == 0
+    stdout = list(stdout_lines)
     
     if success:
-        print(f"  [PASS] {agent_name}: Test passed")
-        if stdout and "Status Code: 200" in stdout:
+        output.append(f"  [PASS] {agent_name}: Test passed")
+        if any("Status Code: 200" in line for line in stdout):
             # Extract key info from successful runs
-            for line in stdout.split('\n'):
-                if 'Tagged:' in line or 'Success:' in line or 'Message:' in line:
-                    print(f"     {line.strip()}")
+            for line in stdout:
+                if _SUMMARY_RE.search(line):
+                    output.append(f"     {line.strip()}")
     else:
-        print(f"  [FAIL] {agent_name}: Test failed (exit code: {result.returncode})")
+        output.append(f"  [FAIL] {agent_name}: Test failed (exit code: {returncode})")
         # Show actual errors from stdout (Traceback, Exception)
-        if stdout:
-            error_lines = []
-            lines = stdout.split('\n')
-            for i, line in enumerate(lines):
-                if 'Traceback' in line or 'Error:' in line or 'Exception:' in line:
-                    # Show traceback context
-                    error_lines.extend(lines[i:min(i+5, len(lines))])
-                    break
-            if error_lines:
-                for line in error_lines[:5]:
-                    if line.strip():
-                        print(f"     {line.strip()[:150]}")
+        for i, line in enumerate(stdout):
+            if _ERR_RE.search(line):
+                # Show traceback context
+                for context in stdout[i:i+5]:
+                    if context.strip():
+                        output.append(f"     {context.strip()[:150]}")
+                break
         # Only show stderr if there are actual errors (not just INFO logs)
-        if stderr and result.returncode != 0:
-            error_lines = [l for l in stderr.split('\n') 
-                          if l.strip() and 'INFO' not in l and 'LiteLLM completion()' not in l]
-            for line in error_lines[:3]:
-                if line.strip():
-                    print(f"     stderr: {line.strip()[:150]}")
+        error_lines = [l for l in stderr_lines if l.strip() and not _NOISE_RE.search(l)]
+        for line in error_lines[:3]:
+            output.append(f"     stderr: {line.strip()[:150]}")
     
-    return success
+    return success, output
+
+def _write_lines(lines):
+    """Write a block of lines to stdout in a single write and flush."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+async def _run_one(agent):
+    """Run one agent test, reporting a failure to start as a failed test."""
+    try:
+        return agent, await test_agent_async(agent)
+    except Exception as e:
+        return agent, (False, [f"  [FAIL] {agent}: Could not run test: {e}"])
+
+async def _run_all(agents):
+    """Run every agent test concurrently, printing each result as it completes.
+
+    Returns (passed agents, failed agents).
+    """
+    passed, failed = [], []
+    for next_done in asyncio.as_completed([_run_one(agent) for agent in agents]):
+        agent, (success, output) = await next_done
+        (passed if success else failed).append(agent)
+        _write_lines(["", f"{agent.upper()} Agent:", *output])
+    return passed, failed
 
 def main():
     """Run all agent tests."""
-    print("="*60)
-    print("TESTING ALL AGENTS")
-    print("Running individual test_simple.py in each agent directory")
-    print("="*60)
+    _write_lines([
+        "="*60,
+        "TESTING ALL AGENTS",
+        "Running individual test_simple.py in each agent directory",
+        "="*60,
+    ])
     
     # List of agents to test
     agents = [
@@ -98,37 +223,30 @@ def main():
         'planner'
     ]
     
-    results = {}
-    
-    for agent in agents:
-        print(f"\n{agent.upper()} Agent:")
-        results[agent] = test_agent(agent)
+    # Tests are dominated by LLM latency, so run them all at once
+    passed, failed = asyncio.run(_run_all(agents))
     
     # Summary
-    print("\n" + "="*60)
-    print("TEST SUMMARY")
-    print("="*60)
-    
-    passed = sum(1 for r in results.values() if r)
-    failed = sum(1 for r in results.values() if not r)
-    
-    print(f"Passed: {passed}/{len(agents)}")
-    print(f"Failed: {failed}/{len(agents)}")
+    lines = [
+        "",
+        "="*60,
+        "TEST SUMMARY",
+        "="*60,
+        f"Passed: {len(passed)}/{len(agents)}",
+        f"Failed: {len(failed)}/{len(agents)}",
+    ]
     
-    if failed > 0:
-        print("\nFailed agents:")
-        for agent, success in results.items():
-            if not success:
-                print(f"  - {agent}")
+    if failed:
+        lines.append("")
+        lines.append("Failed agents:")
+        lines.extend(f"  - {agent}" for agent in failed)
     
-    print("="*60)
+    lines.append("="*60)
+    lines.append("")
+    lines.append("[WARNING] SOME TESTS FAILED" if failed else "[SUCCESS] ALL TESTS PASSED!")
+    _write_lines(lines)
     
-    if failed > 0:
-        print("\n[WARNING] SOME TESTS FAILED")
-        sys.exit(1)
-    else:
-        print("\n[SUCCESS] ALL TESTS PASSED!")
-        sys.exit(0)
+    sys.exit(1 if failed else 0)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file